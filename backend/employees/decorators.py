@@ -1,8 +1,15 @@
 from django.contrib.auth.decorators import user_passes_test
 
+def is_personnel(user):
+    return user.is_authenticated and not user.is_authorized
+
+def is_authorized_user(user):
+    return user.is_authenticated and user.is_authorized
+
+# Each decorator also covers login: anonymous users fail the check and are sent to login_url
 def personnel_required(function=None, redirect_field_name='next', login_url='personnel_login'):
     actual_decorator = user_passes_test(
-        lambda u: u.is_authenticated and not u.is_authorized,
+        is_personnel,
         login_url=login_url,
         redirect_field_name=redirect_field_name
     )
@@ -12,7 +19,7 @@ def personnel_required(function=None, redirect_field_name='next', login_url='per
 
 def authorized_user_required(function=None, redirect_field_name='next', login_url='authorized_login'):
     actual_decorator = user_passes_test(
-        lambda u: u.is_authenticated and u.is_authorized,
+        is_authorized_user,
         login_url=login_url,
         redirect_field_name=redirect_field_name
     )
@@ -1,12 +1,14 @@
 from django.core.management.base import BaseCommand
+from django.db.models import DurationField, ExpressionWrapper, F, Sum
 from employees.models import AttendanceRecord, MonthlyReport, User
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 class Command(BaseCommand):
     help = 'Generate monthly attendance reports for all employees.'
 
     def handle(self, *args, **kwargs):
+        verbosity = kwargs['verbosity']
         today = timezone.now().date()
         # Get the previous month
         first_day_of_current_month = today.replace(day=1)
@@ -14,27 +16,38 @@ class Command(BaseCommand):
         month = last_month.month
         year = last_month.year
 
-        for user in User.objects.filter(is_authorized=False):
-            attendance_records = AttendanceRecord.objects.filter(
-                employee=user,
-                date__month=month,
-                date__year=year
-            )
-            total_seconds = 0
-            for record in attendance_records:
-                if record.first_check_in and record.last_check_out:
-                    check_in = datetime.combine(record.date, record.first_check_in)
-                    check_out = datetime.combine(record.date, record.last_check_out)
-                    duration = check_out - check_in
-                    total_seconds += duration.total_seconds()
-            total_working_hours = timedelta(seconds=total_seconds)
-            # Create or update the MonthlyReport
-            report, created = MonthlyReport.objects.update_or_create(
-                employee=user,
+        # Let the database sum the worked durations, one row per employee
+        worked = ExpressionWrapper(F('last_check_out') - F('first_check_in'), output_field=DurationField())
+        totals = dict(
+            AttendanceRecord.objects.filter(
+                date__gte=last_month.replace(day=1),
+                date__lt=first_day_of_current_month,
+                first_check_in__isnull=False,
+                last_check_out__isnull=False,
+            ).values('employee_id').annotate(total=Sum(worked)).values_list('employee_id', 'total')
+        )
+
+        employees = list(User.objects.filter(is_authorized=False).values_list('id', 'username'))
+        reports = [
+            MonthlyReport(
+                employee_id=employee_id,
                 month=month,
                 year=year,
-                defaults={'total_working_hours': total_working_hours}
+                total_working_hours=totals.get(employee_id) or timedelta(0),
             )
-            self.stdout.write(self.style.SUCCESS(
-                f"Report {'created' if created else 'updated'} for {user.username} for {month}/{year}"
-            ))
\ No newline at end of file
+            for employee_id, username in employees
+        ]
+        # Create or update all MonthlyReports in a single upsert
+        MonthlyReport.objects.bulk_create(
+            reports,
+            update_conflicts=True,
+            unique_fields=['employee', 'month', 'year'],
+            update_fields=['total_working_hours'],
+            batch_size=1000,
+        )
+        if verbosity >= 2:
+            for _, username in employees:
+                self.stdout.write(f"Report generated for {username} for {month}/{year}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(reports)} reports for {month}/{year}"
+        ))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Extract
+from employees.models import AttendanceRecord, EmployeeProfile, LeaveRequest
+
+class Command(BaseCommand):
+    help = 'Recompute the EmployeeProfile counters from leave requests and attendance records.'
+
+    def handle(self, *args, **kwargs):
+        approved_days = LeaveRequest.objects.filter(
+            employee=OuterRef('user'),
+            status='A',
+        ).values('employee').annotate(total=Sum('days')).values('total')
+        late_records = AttendanceRecord.objects.filter(
+            employee=OuterRef('user'),
+            is_late=True,
+        ).values('employee')
+        late_count = late_records.annotate(total=Count('id')).values('total')
+        lateness_seconds = late_records.annotate(
+            total=Cast(Sum(Extract('lateness_duration', 'epoch')), IntegerField())
+        ).values('total')
+
+        # One UPDATE over all profiles
+        updated = EmployeeProfile.objects.update(
+            approved_leave_days=Coalesce(
+                Subquery(approved_days),
+                Value(0),
+                output_field=DecimalField(max_digits=5, decimal_places=2),
+            ),
+            total_late_count=Coalesce(Subquery(late_count), Value(0)),
+            total_lateness_seconds=Coalesce(Subquery(lateness_seconds), Value(0)),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt counters for {updated} profiles"
+        ))
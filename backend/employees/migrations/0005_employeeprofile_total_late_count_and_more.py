@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0004_leaverequest_days"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employeeprofile",
+            name="total_late_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="employeeprofile",
+            name="total_lateness_seconds",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        # Seed the counters from the existing attendance history
+        migrations.RunSQL(
+            sql="""
+                UPDATE employees_employeeprofile AS profile
+                SET total_late_count = late.late_count,
+                    total_lateness_seconds = late.lateness_seconds
+                FROM (
+                    SELECT employee_id,
+                           COUNT(*) AS late_count,
+                           COALESCE(SUM(EXTRACT(EPOCH FROM lateness_duration)), 0)::integer AS lateness_seconds
+                    FROM employees_attendancerecord
+                    WHERE is_late
+                    GROUP BY employee_id
+                ) AS late
+                WHERE profile.user_id = late.employee_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
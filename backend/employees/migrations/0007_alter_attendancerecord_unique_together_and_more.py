@@ -0,0 +1,52 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0006_trigram_search_indexes"),
+    ]
+
+    operations = [
+        # Racy get_or_create calls may have left several records for one day;
+        # fold each group into its oldest record so the constraint can be added
+        migrations.RunSQL(
+            sql="""
+                UPDATE employees_attendancerecord AS record
+                SET first_check_in = duplicate.first_check_in,
+                    last_check_out = duplicate.last_check_out,
+                    is_late = duplicate.is_late,
+                    lateness_duration = duplicate.lateness_duration,
+                    leave_deducted = duplicate.leave_deducted
+                FROM (
+                    SELECT MIN(id) AS id,
+                           MIN(first_check_in) AS first_check_in,
+                           MAX(last_check_out) AS last_check_out,
+                           BOOL_OR(is_late) AS is_late,
+                           MAX(lateness_duration) AS lateness_duration,
+                           SUM(leave_deducted) AS leave_deducted
+                    FROM employees_attendancerecord
+                    GROUP BY employee_id, date
+                    HAVING COUNT(*) > 1
+                ) AS duplicate
+                WHERE record.id = duplicate.id;
+
+                DELETE FROM employees_attendancerecord AS extra
+                USING employees_attendancerecord AS kept
+                WHERE extra.employee_id = kept.employee_id
+                  AND extra.date = kept.date
+                  AND extra.id > kept.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterUniqueTogether(
+            name="attendancerecord",
+            unique_together={("employee", "date")},
+        ),
+        migrations.AddIndex(
+            model_name="attendancerecord",
+            index=models.Index(fields=["date"], name="att_date_idx"),
+        ),
+    ]
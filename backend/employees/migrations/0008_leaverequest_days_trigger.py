@@ -0,0 +1,40 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0007_alter_attendancerecord_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="leaverequest",
+            name="days",
+            field=models.DecimalField(
+                decimal_places=2, default=0.0, editable=False, max_digits=5
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE FUNCTION employees_leaverequest_set_days() RETURNS trigger AS $$
+                BEGIN
+                    NEW.days := NEW.end_date - NEW.start_date + 1;
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER employees_leaverequest_set_days
+                    BEFORE INSERT OR UPDATE ON employees_leaverequest
+                    FOR EACH ROW EXECUTE FUNCTION employees_leaverequest_set_days();
+
+                UPDATE employees_leaverequest SET days = end_date - start_date + 1;
+            """,
+            reverse_sql="""
+                DROP TRIGGER employees_leaverequest_set_days ON employees_leaverequest;
+                DROP FUNCTION employees_leaverequest_set_days();
+            """,
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0008_leaverequest_days_trigger"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_authorized", True)),
+                fields=["id"],
+                name="user_authz_partial",
+            ),
+        ),
+    ]
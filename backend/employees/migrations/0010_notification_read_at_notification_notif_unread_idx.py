@@ -0,0 +1,26 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0009_user_user_authz_partial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="read_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["recipient", "-timestamp"],
+                name="notif_unread_idx",
+            ),
+        ),
+    ]
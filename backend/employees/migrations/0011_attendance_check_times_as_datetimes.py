@@ -0,0 +1,47 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0010_notification_read_at_notification_notif_unread_idx"),
+    ]
+
+    operations = [
+        # PostgreSQL has no cast from time to timestamptz, so combine the stored
+        # times with the record's date (times were recorded in UTC)
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="""
+                        ALTER TABLE employees_attendancerecord
+                            ALTER COLUMN first_check_in TYPE timestamp with time zone
+                                USING (date + first_check_in) AT TIME ZONE 'UTC',
+                            ALTER COLUMN last_check_out TYPE timestamp with time zone
+                                USING (date + last_check_out) AT TIME ZONE 'UTC';
+                    """,
+                    reverse_sql="""
+                        ALTER TABLE employees_attendancerecord
+                            ALTER COLUMN first_check_in TYPE time
+                                USING (first_check_in AT TIME ZONE 'UTC')::time,
+                            ALTER COLUMN last_check_out TYPE time
+                                USING (last_check_out AT TIME ZONE 'UTC')::time;
+                    """,
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="attendancerecord",
+                    name="first_check_in",
+                    field=models.DateTimeField(blank=True, null=True),
+                ),
+                migrations.AlterField(
+                    model_name="attendancerecord",
+                    name="last_check_out",
+                    field=models.DateTimeField(blank=True, null=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0011_attendance_check_times_as_datetimes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="attendancerecord",
+            name="att_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="attendancerecord",
+            index=models.Index(fields=["-date", "-id"], name="att_date_id_idx"),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0012_remove_attendancerecord_att_date_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employeeprofile",
+            name="approved_leave_days",
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=5),
+        ),
+        # Seed the counter from the leave requests approved so far
+        migrations.RunSQL(
+            sql="""
+                UPDATE employees_employeeprofile AS profile
+                SET approved_leave_days = approved.days
+                FROM (
+                    SELECT employee_id, SUM(days) AS days
+                    FROM employees_leaverequest
+                    WHERE status = 'A'
+                    GROUP BY employee_id
+                ) AS approved
+                WHERE profile.user_id = approved.employee_id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
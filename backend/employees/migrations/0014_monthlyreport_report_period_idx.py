@@ -0,0 +1,19 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0013_employeeprofile_approved_leave_days"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="monthlyreport",
+            index=models.Index(
+                fields=["-year", "-month", "employee"], name="report_period_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-15 21:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0014_monthlyreport_report_period_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(
+                condition=models.Q(("status", "P")),
+                fields=["-requested_at"],
+                name="lr_pending_idx",
+            ),
+        ),
+    ]
@@ -1,9 +1,20 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connections, models
+from django.db.models.functions import Cast, Upper
+from django.utils import timezone
 
 class User(AbstractUser):
     is_authorized = models.BooleanField(default=False)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Trigram index matching the UPPER(...) LIKE SQL that icontains searches compile to
+            GinIndex(OpClass(Upper(Cast('username', models.TextField())), name='gin_trgm_ops'), name='user_username_trgm'),
+            # Authorized users are a small minority; index only them for the notification recipient lookup
+            models.Index(fields=['id'], name='user_authz_partial', condition=models.Q(is_authorized=True)),
+        ]
+
     def __str__(self):
         return self.username
     
@@ -13,19 +24,72 @@ class EmployeeProfile(models.Model):
     department = models.CharField(max_length=100)
     position = models.CharField(max_length=100)
     annual_leave_balance = models.DecimalField(max_digits=5, decimal_places=2, default=15.00)
+    # Running lateness totals, kept up to date at check-in
+    total_late_count = models.PositiveIntegerField(default=0)
+    total_lateness_seconds = models.PositiveIntegerField(default=0)
+    # Sum of approved LeaveRequest.days, kept up to date in approve_leave
+    approved_leave_days = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
+
+    class Meta:
+        indexes = [
+            GinIndex(OpClass(Upper(Cast('full_name', models.TextField())), name='gin_trgm_ops'), name='profile_full_name_trgm'),
+        ]
 
     def __str__(self):
         return self.full_name
     
+class AttendanceRecordManager(models.Manager):
+    def check_in(self, employee, date, **values):
+        """
+        Record the employee's check-in for the given date with a single
+        INSERT ... ON CONFLICT (employee, date) DO UPDATE ... WHERE first_check_in IS NULL
+        statement, creating the record if needed. Returns whether it was recorded,
+        i.e. False if a check-in was already recorded.
+        """
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        meta = self.model._meta
+        fields = [field for field in meta.concrete_fields if not field.primary_key]
+        updates = [qn(meta.get_field(name).column) for name in values]
+        values = {'employee': employee.pk, 'date': date, **values}
+        params = [
+            field.get_db_prep_save(values[field.name] if field.name in values else field.get_default(), connection)
+            for field in fields
+        ]
+        table = qn(meta.db_table)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(qn(field.column) for field in fields)}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))}) "
+            f"ON CONFLICT ({qn(meta.get_field('employee').column)}, {qn(meta.get_field('date').column)}) "
+            f"DO UPDATE SET {', '.join(f'{column} = EXCLUDED.{column}' for column in updates)} "
+            f"WHERE {table}.{qn(meta.get_field('first_check_in').column)} IS NULL "
+            f"RETURNING {qn(meta.pk.column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone() is not None
+
+
 class AttendanceRecord(models.Model):
     employee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attendance_records')
     date = models.DateField()
-    first_check_in = models.TimeField(null=True, blank=True)
-    last_check_out = models.TimeField(null=True, blank=True)
+    first_check_in = models.DateTimeField(null=True, blank=True)
+    last_check_out = models.DateTimeField(null=True, blank=True)
     is_late = models.BooleanField(default=False)
     lateness_duration = models.DurationField(null=True, blank=True)
     leave_deducted = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
 
+    objects = AttendanceRecordManager()
+
+    class Meta:
+        # One record per employee per day; the unique index also serves (employee, date) lookups
+        unique_together = ('employee', 'date')
+        indexes = [
+            # Matches the (date, id) keyset ordering of view_attendance_records, whose date <= cursor
+            # bound seeks into it; also serves date ranges
+            models.Index(fields=['-date', '-id'], name='att_date_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee.username} - {self.date}"
 
@@ -43,22 +107,54 @@ class LeaveRequest(models.Model):
     status = models.CharField(max_length=1, choices=STATUS_CHOICES, default='P')
     requested_at = models.DateTimeField(auto_now_add=True)
     responded_at = models.DateTimeField(null=True, blank=True)
-    days = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)  
-    
+    # Set from start_date/end_date by a database trigger (see migration 0008),
+    # so bulk_create and queryset updates keep it consistent too
+    days = models.DecimalField(max_digits=5, decimal_places=2, default=0.00, editable=False)
+
+    class Meta:
+        indexes = [
+            # Pending requests, newest first (view_pending_leave_requests)
+            models.Index(fields=['-requested_at'], name='lr_pending_idx', condition=models.Q(status='P')),
+        ]
+
     def __str__(self):
         return f"{self.employee.username} - {self.get_status_display()} from {self.start_date} to {self.end_date}"
     
-    def save(self, *args, **kwargs):
-        # Calculate number of days upon saving
-        self.days = (self.end_date - self.start_date).days + 1
-        super().save(*args, **kwargs)
-    
+
+class NotificationManager(models.Manager):
+    def notify_authorized_users(self, message):
+        """
+        Create one notification per authorized user with a single
+        INSERT ... SELECT statement, without loading the users.
+        """
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        meta = self.model._meta
+        user_meta = User._meta
+        columns = [meta.get_field(name).column for name in ('recipient', 'message', 'is_read', 'timestamp')]
+        sql = (
+            f"INSERT INTO {qn(meta.db_table)} ({', '.join(qn(column) for column in columns)}) "
+            f"SELECT {qn(user_meta.pk.column)}, %s, %s, %s FROM {qn(user_meta.db_table)} "
+            f"WHERE {qn(user_meta.get_field('is_authorized').column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [message, False, timezone.now()])
+            return cursor.rowcount
 
 class Notification(models.Model):
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     timestamp = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    objects = NotificationManager()
+
+    class Meta:
+        indexes = [
+            # Unread notifications per recipient, newest first (authorized dashboard)
+            models.Index(fields=['recipient', '-timestamp'], name='notif_unread_idx', condition=models.Q(is_read=False)),
+        ]
 
     def __str__(self):
         return f"Notification to {self.recipient.username} at {self.timestamp}"
@@ -71,6 +167,10 @@ class MonthlyReport(models.Model):
 
     class Meta:
         unique_together = ('employee', 'month', 'year')
+        indexes = [
+            # Newest-first listing in view_monthly_reports
+            models.Index(fields=['-year', '-month', 'employee'], name='report_period_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.username} - {self.month}/{self.year}"
\ No newline at end of file
@@ -6,7 +6,3 @@ from .models import User, EmployeeProfile
 def create_employee_profile(sender, instance, created, **kwargs):
     if created:
         EmployeeProfile.objects.create(user=instance, full_name=instance.username)
-
-@receiver(post_save, sender=User)
-def save_employee_profile(sender, instance, **kwargs):
-    instance.profile.save()
\ No newline at end of file
@@ -1,3 +1,170 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db.models.query import QuerySet
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import AttendanceRecord, EmployeeProfile, LeaveRequest, MonthlyReport, Notification, User
+
+
+class ViewPendingLeaveRequestsTests(TestCase):
+    def setUp(self):
+        self.authorized_user = User.objects.create_user('manager', password='password', is_authorized=True)
+        self.employee = User.objects.create_user('employee', password='password')
+        self.client.force_login(self.authorized_user)
+
+    def create_leave_requests(self, count):
+        for _ in range(count):
+            LeaveRequest.objects.create(
+                employee=self.employee, start_date=date(2030, 1, 1), end_date=date(2030, 1, 2), reason='Holiday'
+            )
+
+    def test_query_count_does_not_grow_with_pending_requests(self):
+        self.create_leave_requests(3)
+        # session, user, paginator count, page of requests joined with their employees
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('view_pending_leave_requests'))
+        self.assertEqual(len(response.context['page_obj'].object_list), 3)
+        self.assertContains(response, '<td>employee</td>', count=3)
+
+        self.create_leave_requests(10)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('view_pending_leave_requests'))
+        self.assertEqual(len(response.context['page_obj'].object_list), 13)
+        self.assertContains(response, '<td>employee</td>', count=13)
+
+    def test_paginates_pending_requests(self):
+        self.create_leave_requests(30)
+        response = self.client.get(reverse('view_pending_leave_requests'))
+        self.assertEqual(len(response.context['page_obj'].object_list), 25)
+        response = self.client.get(reverse('view_pending_leave_requests'), {'page': 2})
+        self.assertEqual(len(response.context['page_obj'].object_list), 5)
+
+
+class AttendanceCheckInTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user('employee', password='password')
+        self.client.force_login(self.employee)
+
+    def check_in(self, check_in_time):
+        return self.client.post(reverse('attendance_check_in'), {'check_in_time': check_in_time}, follow=True)
+
+    def balance(self):
+        return EmployeeProfile.objects.get(user=self.employee).annual_leave_balance
+
+    def test_first_check_in_creates_record(self):
+        self.check_in('07:45')
+        record = AttendanceRecord.objects.get(employee=self.employee)
+        self.assertEqual(record.date, timezone.now().date())
+        self.assertEqual(timezone.localtime(record.first_check_in).strftime('%H:%M'), '07:45')
+        self.assertFalse(record.is_late)
+
+    def test_second_check_in_is_rolled_back(self):
+        self.check_in('07:45')
+        balance = self.balance()
+        # Let only the page guard's AttendanceRecord lookup miss, as if both submits passed it
+        # concurrently; the check-in upsert must then refuse and undo the deduction
+        exists = QuerySet.exists
+
+        def guard_misses(queryset):
+            return False if queryset.model is AttendanceRecord else exists(queryset)
+
+        with mock.patch.object(QuerySet, 'exists', autospec=True, side_effect=guard_misses) as patched_exists:
+            response = self.check_in('10:00')
+        self.assertIn(AttendanceRecord, [call.args[0].model for call in patched_exists.call_args_list])
+        self.assertContains(response, 'You have already checked in today.')
+        self.assertEqual(self.balance(), balance)
+        record = AttendanceRecord.objects.get(employee=self.employee)
+        self.assertEqual(timezone.localtime(record.first_check_in).strftime('%H:%M'), '07:45')
+        self.assertFalse(record.is_late)
+
+    def test_late_check_in_with_insufficient_balance_is_not_marked_late(self):
+        EmployeeProfile.objects.filter(user=self.employee).update(annual_leave_balance=Decimal('0.00'))
+        response = self.check_in('10:00')
+        self.assertContains(response, 'Insufficient leave balance')
+        record = AttendanceRecord.objects.get(employee=self.employee)
+        self.assertFalse(record.is_late)
+        self.assertEqual(record.leave_deducted, 0)
+        self.assertEqual(self.balance(), Decimal('0.00'))
+
+
+class NotifyAuthorizedUsersTests(TestCase):
+    def test_creates_one_unread_notification_per_authorized_user(self):
+        managers = [User.objects.create_user(f'manager{i}', password='password', is_authorized=True) for i in range(2)]
+        employee = User.objects.create_user('employee', password='password')
+        before = timezone.now()
+
+        with self.assertNumQueries(1):
+            created = Notification.objects.notify_authorized_users('Leave requested')
+
+        self.assertEqual(created, 2)
+        notifications = Notification.objects.order_by('recipient_id')
+        self.assertEqual([notification.recipient_id for notification in notifications], [manager.id for manager in managers])
+        self.assertFalse(Notification.objects.filter(recipient=employee).exists())
+        for notification in notifications:
+            self.assertEqual(notification.message, 'Leave requested')
+            self.assertFalse(notification.is_read)
+            self.assertIsNone(notification.read_at)
+            self.assertGreaterEqual(notification.timestamp, before)
+
+
+class ViewAttendanceRecordsTests(TestCase):
+    def setUp(self):
+        self.authorized_user = User.objects.create_user('manager', password='password', is_authorized=True)
+        self.client.force_login(self.authorized_user)
+
+    def test_pages_through_records_sharing_a_date(self):
+        # 22 records on the newest date, so the first page ends in the middle of a date tie
+        employees = [User.objects.create_user(f'employee{i}', password='password') for i in range(22)]
+        for employee in employees:
+            AttendanceRecord.objects.create(employee=employee, date=date(2030, 1, 2))
+        for employee in employees[:3]:
+            AttendanceRecord.objects.create(employee=employee, date=date(2030, 1, 1))
+
+        response = self.client.get(reverse('view_attendance_records'))
+        first_page = response.context['records']
+        cursor = response.context['next_cursor']
+        self.assertEqual(len(first_page), 20)
+        self.assertEqual(cursor.date, date(2030, 1, 2))
+
+        response = self.client.get(reverse('view_attendance_records'), {'after': cursor.date.isoformat(), 'after_id': cursor.id})
+        second_page = response.context['records']
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertEqual([record.date for record in second_page], [date(2030, 1, 2)] * 2 + [date(2030, 1, 1)] * 3)
+
+        seen = [record.id for record in first_page + second_page]
+        expected = list(AttendanceRecord.objects.order_by('-date', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+
+class EmployeeSearchTests(TestCase):
+    def setUp(self):
+        self.authorized_user = User.objects.create_user('manager', password='password', is_authorized=True)
+        self.client.force_login(self.authorized_user)
+        self.alice = User.objects.create_user('alice', password='password')
+        self.bob = User.objects.create_user('bob', password='password')
+        EmployeeProfile.objects.filter(user=self.bob).update(full_name='Robert Marley')
+        for employee in (self.alice, self.bob):
+            AttendanceRecord.objects.create(employee=employee, date=date(2030, 1, 1))
+            MonthlyReport.objects.create(employee=employee, month=1, year=2030, total_working_hours=timedelta(hours=160))
+
+    def search_attendance_records(self, query):
+        response = self.client.get(reverse('view_attendance_records'), {'q': query})
+        return [record.employee_id for record in response.context['records']]
+
+    def search_monthly_reports(self, query):
+        response = self.client.get(reverse('view_monthly_reports'), {'q': query})
+        return [report.employee_id for report in response.context['page_obj'].object_list]
+
+    def test_attendance_records_match_username_or_full_name(self):
+        self.assertEqual(self.search_attendance_records('ALI'), [self.alice.id])
+        self.assertEqual(self.search_attendance_records('marl'), [self.bob.id])
+        self.assertEqual(self.search_attendance_records('nobody'), [])
 
-# Create your tests here.
+    def test_monthly_reports_match_username_or_full_name(self):
+        self.assertEqual(self.search_monthly_reports('ALI'), [self.alice.id])
+        self.assertEqual(self.search_monthly_reports('marl'), [self.bob.id])
+        self.assertEqual(self.search_monthly_reports('nobody'), [])
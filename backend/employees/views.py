@@ -1,18 +1,25 @@
 from django.shortcuts import render, redirect
-from django.contrib.auth import authenticate, login, get_user_model
+from django.contrib.auth import authenticate, login
 from django.contrib import messages
-from django.contrib.auth.decorators import login_required, user_passes_test
 from .decorators import personnel_required, authorized_user_required    # custom decorators
 from .forms import CheckInForm, CheckOutForm
-from .models import AttendanceRecord, LeaveRequest, Notification, MonthlyReport, User
-from datetime import datetime, time, timedelta
+from .models import AttendanceRecord, EmployeeProfile, LeaveRequest, Notification, MonthlyReport, User
+from datetime import date, datetime, timedelta
 from django.utils import timezone
-from django.db.models import Q, Sum
-from django.db import models
+from django.db.models import F, Q
+from django.db import models, transaction
 from django.core.paginator import Paginator
 from decimal import Decimal
+from functools import partial
 from .forms import LeaveRequestForm
 from django.shortcuts import get_object_or_404
+from django.http import Http404
+
+_COMPANY_START_SECONDS = 8 * 3600  # 08:00 AM
+
+# Leave deduction for each whole minute of lateness (0.25 days per 30 minutes),
+# precomputed for every minute of the day
+_DEDUCTION_TABLE = tuple(round(Decimal(minutes) / 30 * Decimal('0.25'), 2) for minutes in range(24 * 60))
 
 def personnel_login(request):
     if request.method == 'POST':
@@ -39,33 +46,30 @@ def authorized_login(request):
     return render(request, 'employees/authorized_login.html')
 
 
-def is_personnel(user):
-    return user.is_authenticated and not user.is_authorized
-
-def is_authorized_user(user):
-    return user.is_authenticated and user.is_authorized
-
 @personnel_required
 def personnel_dashboard(request):
     return render(request, 'employees/personnel_dashboard.html')
 
 @authorized_user_required
 def authorized_dashboard(request):
-    notifications = request.user.notifications.filter(is_read = False).order_by('-timestamp')
-    # set up this mechanism later
-    # notifications.update(is_read=True)    
+    # The template only renders message and timestamp; cap how many are loaded at once
+    notifications = list(
+        request.user.notifications.filter(is_read = False).only('message', 'timestamp').order_by('-timestamp')[:50]
+    )
+    # Mark the ones shown as read in a single UPDATE
+    if notifications:
+        Notification.objects.filter(pk__in=[notification.pk for notification in notifications]).update(
+            is_read=True, read_at=timezone.now()
+        )
     return render(request, 'employees/authorized_dashboard.html', {'notifications': notifications})
 
-@login_required(login_url='personnel_login')
-@user_passes_test(is_personnel)
+@personnel_required
 def attendance_check_in(request):
     user = request.user
     today = timezone.now().date()
     now_time = timezone.now().time()
 
-    attendance, created = AttendanceRecord.objects.get_or_create(employee=user, date=today)
-
-    if attendance.first_check_in:
+    if AttendanceRecord.objects.filter(employee=user, date=today, first_check_in__isnull=False).exists():
         messages.info(request, "You have already checked in today.")
         return redirect('personnel_dashboard')
 
@@ -73,47 +77,63 @@ def attendance_check_in(request):
         form = CheckInForm(request.POST)
         if form.is_valid():
             check_in_time = form.cleaned_data.get('check_in_time') or now_time
-            attendance.first_check_in = check_in_time
+            is_late = False
+            lateness_duration = None
+            leave_deducted = 0
 
             # Determine if late
-            company_start_time = time(8, 0)  # 08:00 AM
-            if check_in_time > company_start_time:
-                attendance.is_late = True
+            check_in_seconds = check_in_time.hour * 3600 + check_in_time.minute * 60 + check_in_time.second
+            lateness_seconds = check_in_seconds - _COMPANY_START_SECONDS
+            late = lateness_seconds > 0
+            if late:
                 # Calculate lateness_duration
-                check_in_datetime = datetime.combine(today, check_in_time)
-                company_start_datetime = datetime.combine(today, company_start_time)
-                lateness = check_in_datetime - company_start_datetime
-                attendance.lateness_duration = lateness
+                lateness = timedelta(seconds=lateness_seconds)
 
                 # Calculate leave deduction
-                lateness_minutes = lateness.seconds // 60
-                deduction_rate = 0.25  # 0.25 days per 30 minutes
-                deduction = (lateness_minutes / 30) * deduction_rate
-                deduction = round(Decimal(deduction), 2)
-
-                # Update leave balance
-                profile = user.profile  # Assuming OneToOneField from User to EmployeeProfile
-                if profile.annual_leave_balance >= deduction:
-                    profile.annual_leave_balance -= deduction
-                    profile.save()
-                    attendance.leave_deducted = deduction
-                    if profile.annual_leave_balance <3:
-                        notify_authorized_users_low_leave(user)
-                else:
+                lateness_minutes = lateness_seconds // 60
+                deduction = _DEDUCTION_TABLE[lateness_minutes]
+
+            with transaction.atomic():
+                if late:
+                    # Update leave balance in a single UPDATE; no row matches if the balance is insufficient
+                    profile = EmployeeProfile.objects.filter(user=user)
+                    updated = profile.filter(annual_leave_balance__gte=deduction).update(
+                        annual_leave_balance=F('annual_leave_balance') - deduction,
+                        total_late_count=F('total_late_count') + 1,
+                        total_lateness_seconds=F('total_lateness_seconds') + lateness_seconds,
+                    )
+                    if updated == 1:
+                        is_late = True
+                        lateness_duration = lateness
+                        leave_deducted = deduction
+                        balance = profile.values_list('annual_leave_balance', flat=True).get()
+                        # Fan out once the check-in is committed; dropped if it is rolled back
+                        if balance < 3:
+                            transaction.on_commit(partial(notify_authorized_users_low_leave, user, balance))
+                        transaction.on_commit(partial(notify_authorized_users_late, user, today, lateness, deduction))
+
+                # Create or claim today's record in one statement; a repeated or concurrent submit finds it already taken
+                claimed = AttendanceRecord.objects.check_in(
+                    user,
+                    today,
+                    first_check_in=timezone.make_aware(datetime.combine(today, check_in_time)),
+                    is_late=is_late,
+                    lateness_duration=lateness_duration,
+                    leave_deducted=leave_deducted,
+                )
+                if not claimed:
+                    transaction.set_rollback(True)
+
+            if not claimed:
+                messages.info(request, "You have already checked in today.")
+                return redirect('personnel_dashboard')
+
+            if late:
+                if not is_late:
                     # Handle insufficient leave balance
                     messages.error(request, "Insufficient leave balance for deduction due to lateness.")
-                    attendance.is_late = False
-                    attendance.lateness_duration = None
                     deduction = 0
                 messages.info(request, f"Late by {lateness_minutes} minutes. Deducted {deduction} days from your annual leave.")
-            else:
-                attendance.is_late = False
-                attendance.lateness_duration = None
-
-            attendance.save()
-            # Create notification if late
-            if attendance.is_late:
-                notify_authorized_users_late(user, today, lateness, deduction)
 
             return redirect('personnel_dashboard')
     else:
@@ -125,26 +145,23 @@ def attendance_check_in(request):
     return render(request, 'employees/attendance_check_in.html', context)
 
 
-# problematic --> getting all users and filter authorized ones requires additional work
-# notification object should be handled
+def _notify_authorized_users(message):
+    # One INSERT ... SELECT; the recipients never leave the database
+    Notification.objects.notify_authorized_users(message)
+
+
 def notify_authorized_users_late(employee, date, lateness, deduction):
-    # Get all authorized users
-    User = get_user_model() # import from model can also resolve the issue
-    authorized_users = User.objects.filter(is_authorized=True)
     message = f"Employee {employee.username} was late on {date} by {lateness.seconds // 60} minutes and {deduction} days were deducted from their leave."
-    for user in authorized_users:
-        Notification.objects.create(recipient=user, message=message)
+    _notify_authorized_users(message)
 
 
-@login_required(login_url='personnel_login')
-@user_passes_test(is_personnel)
+@personnel_required
 def view_leave_balance(request):
     user = request.user
     profile = user.profile
     total_leave = float(profile.annual_leave_balance)  # Convert Decimal to float for arithmetic
     # Calculate granted leave doesn't count from
-    approved_leave = LeaveRequest.objects.filter(employee=user, status='A').aggregate(total=Sum('days')).get('total') or 0
-    approved_leave = float(approved_leave)  # Ensure it's a float
+    approved_leave = float(profile.approved_leave_days)  # Ensure it's a float
     remaining_leave = total_leave - approved_leave  # Calculate remaining leave
     
     context = {
@@ -155,11 +172,9 @@ def view_leave_balance(request):
     return render(request, 'employees/view_leave_balance.html', context)
 
 
-@login_required(login_url='personnel_login')
-@user_passes_test(is_personnel)
+@personnel_required
 def request_leave(request):
     user = request.user
-    profile = user.profile
     if request.method == 'POST':
         form = LeaveRequestForm(request.POST)
         if form.is_valid():
@@ -167,13 +182,16 @@ def request_leave(request):
             leave_request.employee = user
             # Calculate number of days
             leave_request.days = (leave_request.end_date - leave_request.start_date).days + 1
-            # Check if sufficient leave balance
-            if profile.annual_leave_balance >= leave_request.days:
-                profile.annual_leave_balance -= leave_request.days
-                profile.save()
-                leave_request.save()
-                # Notify Authorized Users
-                notify_authorized_users_leave_request(leave_request)
+            with transaction.atomic():
+                # Deduct only if the balance is sufficient, in a single UPDATE
+                updated = EmployeeProfile.objects.filter(user=user, annual_leave_balance__gte=leave_request.days).update(
+                    annual_leave_balance=F('annual_leave_balance') - leave_request.days
+                )
+                if updated == 1:
+                    leave_request.save()
+                    # Notify Authorized Users once the request is committed
+                    transaction.on_commit(partial(notify_authorized_users_leave_request, leave_request))
+            if updated == 1:
                 messages.success(request, "Leave request submitted successfully.")
                 return redirect('view_leave_balance')
             else:
@@ -186,96 +204,96 @@ def request_leave(request):
     return render(request, 'employees/request_leave.html', context)
 
 def notify_authorized_users_leave_request(leave_request):
-    User = get_user_model() # import from model can also resolve the issue
-    authorized_users = User.objects.filter(is_authorized=True)
     message = f"Employee {leave_request.employee.username} has requested leave from {leave_request.start_date} to {leave_request.end_date} ({leave_request.days} days). Reason: {leave_request.reason}"
-    for user in authorized_users:
-        Notification.objects.create(recipient=user, message=message)
+    _notify_authorized_users(message)
 
         
-@login_required(login_url='authorized_login')
-@user_passes_test(is_authorized_user)
+@authorized_user_required
 def approve_leave(request, leave_id):
-    leave_request = get_object_or_404(LeaveRequest, id=leave_id, status='P')
     if request.method == 'POST':
-        action = request.POST.get('action')
-        if action == 'approve':
-            leave_request.status = 'A'
-            messages.success(request, "Leave request approved.")
-        elif action == 'reject':
-            # Refund the leave days if rejected
-            profile = leave_request.employee.profile
-            profile.annual_leave_balance += leave_request.days
-            profile.save()
-            leave_request.status = 'R'
-            messages.success(request, "Leave request rejected.")
-        leave_request.responded_at = timezone.now()
-        leave_request.save()
-
-        # Notify the employee about the decision
-        notify_employee_leave_decision(leave_request)
+        status = {'approve': 'A', 'reject': 'R'}.get(request.POST.get('action'))
+        if status is None:
+            return redirect('view_pending_leave_requests')
+        with transaction.atomic():
+            # Decide the request only while it is still pending; a concurrent decision leaves no row to update
+            if not LeaveRequest.objects.filter(id=leave_id, status='P').update(status=status, responded_at=timezone.now()):
+                raise Http404("No pending leave request matches the given query.")
+            leave_request = LeaveRequest.objects.only('employee', 'start_date', 'end_date', 'status', 'days').get(id=leave_id)
+            if status == 'A':
+                EmployeeProfile.objects.filter(user_id=leave_request.employee_id).update(
+                    approved_leave_days=F('approved_leave_days') + leave_request.days
+                )
+                messages.success(request, "Leave request approved.")
+            else:
+                # Refund the leave days if rejected
+                EmployeeProfile.objects.filter(user_id=leave_request.employee_id).update(
+                    annual_leave_balance=F('annual_leave_balance') + leave_request.days
+                )
+                messages.success(request, "Leave request rejected.")
+
+            # Notify the employee about the decision
+            transaction.on_commit(partial(notify_employee_leave_decision, leave_request))
 
         return redirect('view_pending_leave_requests')
+    leave_request = get_object_or_404(LeaveRequest, id=leave_id, status='P')
     return render(request, 'employees/approve_leave.html', {'leave_request': leave_request})
 
-@login_required(login_url='authorized_login')
-@user_passes_test(is_authorized_user)
+@authorized_user_required
 def view_pending_leave_requests(request):
-    pending_requests = LeaveRequest.objects.filter(status='P').order_by('-requested_at')
+    pending_requests = LeaveRequest.objects.filter(status='P').select_related('employee').order_by('-requested_at')
+
+    # Pagination
+    paginator = Paginator(pending_requests, 25)  # Show 25 requests per page
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+
     context = {
-        'pending_requests': pending_requests
+        'page_obj': page_obj
     }
     return render(request, 'employees/view_pending_leave_requests.html', context)
 
 def notify_employee_leave_decision(leave_request):
-    employee = leave_request.employee
     if leave_request.status == 'A':
         message = f"Your leave request from {leave_request.start_date} to {leave_request.end_date} has been approved."
     elif leave_request.status == 'R':
         message = f"Your leave request from {leave_request.start_date} to {leave_request.end_date} has been rejected."
-    Notification.objects.create(recipient=employee, message=message)
+    # Only the FK is needed; avoid loading the employee row
+    Notification.objects.create(recipient_id=leave_request.employee_id, message=message)
 
 
 
 
 
 
-def notify_authorized_users_low_leave(user):
-    User = get_user_model() # import from model can also resolve the issue
+def notify_authorized_users_low_leave(user, balance):
     # Check if leave balance is below 3 days
-    if user.profile.annual_leave_balance < 3:
-        authorized_users = User.objects.filter(is_authorized=True)
-        message = f"Employee {user.username} now has {user.profile.annual_leave_balance} days of annual leave remaining."
-        for auth_user in authorized_users:
-            Notification.objects.create(recipient=auth_user, message=message)
+    if balance < 3:
+        message = f"Employee {user.username} now has {balance} days of annual leave remaining."
+        _notify_authorized_users(message)
 
 
-@login_required(login_url='personnel_login')
-@user_passes_test(is_personnel)
+@personnel_required
 def attendance_check_out(request):
     user = request.user
     today = timezone.now().date()
     now_time = timezone.now().time()
-
-    try:
-        attendance = AttendanceRecord.objects.get(employee=user, date=today)
-    except AttendanceRecord.DoesNotExist:
-        messages.error(request, "You haven't checked in today.")
-        return redirect('personnel_dashboard')
-
-    if attendance.last_check_out:
-        messages.info(request, "You have already checked out today.")
-        return redirect('personnel_dashboard')
+    # Today's record that has been checked in but not yet checked out
+    open_record = AttendanceRecord.objects.filter(
+        employee=user, date=today, first_check_in__isnull=False, last_check_out__isnull=True
+    )
 
     if request.method == 'POST':
         form = CheckOutForm(request.POST)
         if form.is_valid():
             check_out_time = form.cleaned_data.get('check_out_time') or now_time
-            attendance.last_check_out = check_out_time
-            attendance.save()
-            messages.success(request, "Check-Out successful.")
-            return redirect('personnel_dashboard')
+            # Claim the check-out in a single UPDATE; 0 rows means there was nothing to check out of
+            if open_record.update(last_check_out=timezone.make_aware(datetime.combine(today, check_out_time))):
+                messages.success(request, "Check-Out successful.")
+                return redirect('personnel_dashboard')
+            return _check_out_refused(request, user, today)
     else:
+        if not open_record.exists():
+            return _check_out_refused(request, user, today)
         form = CheckOutForm()
 
     context = {
@@ -283,43 +301,72 @@ def attendance_check_out(request):
     }
     return render(request, 'employees/attendance_check_out.html', context)
 
-@login_required(login_url='authorized_login')
-@user_passes_test(is_authorized_user)
+def _check_out_refused(request, user, today):
+    # Only reached off the happy path, to tell the two refusals apart
+    if AttendanceRecord.objects.filter(employee=user, date=today, first_check_in__isnull=False).exists():
+        messages.info(request, "You have already checked out today.")
+    else:
+        messages.error(request, "You haven't checked in today.")
+    return redirect('personnel_dashboard')
+
+def _employee_search(query):
+    # One subquery per table so each icontains (UPPER(col::text) LIKE UPPER(...)) can probe that
+    # table's pg_trgm GIN index; an OR across the joined tables is only applied after the join
+    return (
+        Q(employee_id__in=User.objects.filter(username__icontains=query).values('id'))
+        | Q(employee_id__in=EmployeeProfile.objects.filter(full_name__icontains=query).values('user_id'))
+    )
+
+
+@authorized_user_required
 def view_attendance_records(request):
-    records = AttendanceRecord.objects.select_related('employee').all().order_by('-date')
+    records = AttendanceRecord.objects.select_related('employee', 'employee__profile').only(
+        'date', 'first_check_in', 'last_check_out', 'is_late', 'lateness_duration',
+        'employee__username', 'employee__profile__full_name',
+    ).order_by('-date', '-id')
     
     # Search or filter functionality can be added here
     query = request.GET.get('q')
     if query:
-        records = records.filter(
-            Q(employee__username__icontains=query) |
-            Q(employee__profile__full_name__icontains=query)
-        )
+        records = records.filter(_employee_search(query))
     
-    # Pagination
-    paginator = Paginator(records, 20)  # Show 20 records per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination: continue after the last (date, id) shown instead of using an OFFSET
+    page_size = 20
+    after = request.GET.get('after')
+    after_id = request.GET.get('after_id')
+    try:
+        after = date.fromisoformat(after) if after else None
+        after_id = int(after_id) if after_id else None
+    except ValueError:
+        after = after_id = None
+    if after and after_id:
+        # date <= after lets the (date DESC, id DESC) index seek to the cursor; the OR only trims the tied date
+        records = records.filter(date__lte=after).filter(Q(date__lt=after) | Q(id__lt=after_id))
+    else:
+        after = None
+    
+    records = list(records[:page_size + 1])
+    next_cursor = records[page_size - 1] if len(records) > page_size else None
     
     context = {
-        'page_obj': page_obj,
+        'records': records[:page_size],
+        'next_cursor': next_cursor,
+        'is_first_page': after is None,
         'query': query,
     }
     return render(request, 'employees/view_attendance_records.html', context)
 
 
-@login_required(login_url='authorized_login')
-@user_passes_test(is_authorized_user)
+@authorized_user_required
 def view_monthly_reports(request):
-    reports = MonthlyReport.objects.select_related('employee').all().order_by('-year', '-month')
+    reports = MonthlyReport.objects.select_related('employee', 'employee__profile').only(
+        'month', 'year', 'total_working_hours', 'employee__username', 'employee__profile__full_name',
+    ).order_by('-year', '-month', 'employee')
     
     # Search or filter functionality can be added here
     query = request.GET.get('q')
     if query:
-        reports = reports.filter(
-            Q(employee__username__icontains=query) |
-            Q(employee__profile__full_name__icontains=query)
-        )
+        reports = reports.filter(_employee_search(query))
     
     # Pagination
     paginator = Paginator(reports, 20)  # Show 20 reports per page